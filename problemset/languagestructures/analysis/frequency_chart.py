@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from collections import defaultdict
-import glob
+from functools import lru_cache
+import re
+
+from output_parts import list_outputs, read_rows
 
 CATEGORY_LABELS = {
     'SYNTAX_ERROR': 'Syntax Error',
@@ -21,6 +25,9 @@ CATEGORY_LABELS = {
     'DATA_SET': 'Set'
 }
 
+# Single alternation over every prefix, longest first so IMPORT_FROM wins over IMPORT
+PREFIX_RE = re.compile('|'.join(map(re.escape, sorted(CATEGORY_LABELS, key=len, reverse=True))))
+
 CATEGORY_COLORS = {
     'Syntax Error': '#e74c3c',
     'Imports': '#3498db',
@@ -39,26 +46,20 @@ CATEGORY_COLORS = {
 }
 
 
+@lru_cache(maxsize=None)
 def categorize_construct(construct):
     """Categorize a construct based on its prefix."""
-    for prefix, label in CATEGORY_LABELS.items():
-        if construct.startswith(prefix):
-            return label
-    return 'Other'
+    match = PREFIX_RE.match(construct)
+    return CATEGORY_LABELS[match.group()] if match else 'Other'
 
 
-def load_data(file_pattern):
-    """Load and aggregate data from output files."""
+def load_data(files):
+    """Load and aggregate data from the given output files."""
     counts = defaultdict(int)
 
-    for filepath in glob.glob(file_pattern):
-        with open(filepath, 'r') as f:
-            for line in f:
-                parts = line.strip().split('\t')
-                if len(parts) >= 3:
-                    construct = parts[1].strip()
-                    count = int(parts[2].strip())
-                    counts[construct] += count
+    for row in read_rows(files):
+        if len(row) >= 3:
+            counts[row[1]] += int(row[2])
 
     return counts
 
@@ -90,7 +91,9 @@ def create_bar_chart(category_counts):
     colors = [CATEGORY_COLORS.get(cat, '#95a5a6') for cat in labels]
 
     # Create figure
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
     # Create bar chart
     bars = ax.barh(range(len(labels)), counts, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
@@ -103,11 +106,8 @@ def create_bar_chart(category_counts):
                  fontsize=16, fontweight='bold', pad=20)
 
     # Add value labels on bars
-    for i, (bar, count) in enumerate(zip(bars, counts)):
-        width = bar.get_width()
-        ax.text(width, bar.get_y() + bar.get_height() / 2,
-                f' {count:,}',
-                ha='left', va='center', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, labels=[f'{count:,}' for count in counts],
+                 padding=3, fontsize=10, fontweight='bold')
 
     # Add grid for readability
     ax.grid(axis='x', alpha=0.3, linestyle='--')
@@ -116,7 +116,7 @@ def create_bar_chart(category_counts):
     # Invert y-axis so highest is at top
     ax.invert_yaxis()
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -124,7 +124,8 @@ def main():
     # Load data from output files
     print("Loading data from output files...")
     file_pattern = 'problemset/languagestructures/output/output-run1_part-*'
-    counts = load_data(file_pattern)
+    files = list_outputs(file_pattern)
+    counts = load_data(files)
 
     print(f"Loaded {len(counts)} unique constructs")
 
@@ -142,12 +143,9 @@ def main():
     if fig:
         # Save the figure
         output_path = 'problemset/languagestructures/analysis/frequency_chart.png'
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"Bar chart saved to: {output_path}")
 
-        # Show the plot
-        plt.show()
-
 
 # cd /Users/owensizemore/code/duke/compsci512project && python3 problemset/languagestructures/analysis/frequency_chart.py
 if __name__ == '__main__':
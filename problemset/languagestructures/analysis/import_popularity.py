@@ -3,48 +3,60 @@
 Analyze import popularity by calculating the percentage of files that use each import.
 """
 
-import matplotlib.pyplot as plt
-from collections import defaultdict
-import glob
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+import re
 
+from output_parts import list_outputs, read_rows
 
-def load_import_data(file_pattern):
-    """Load import data and track which files use which imports."""
-    import_files = defaultdict(set)  # import_name -> set of files
-    all_files = set()
+# IMPORT_<module> or IMPORT_FROM_<module>.<name>
+IMPORT_LABEL_RE = re.compile(r'^IMPORT_(FROM_)?(.+)$')
 
-    for filepath in glob.glob(file_pattern):
-        with open(filepath, 'r') as f:
-            for line in f:
-                parts = line.strip().split('\t')
-                if len(parts) >= 3:
-                    filename = parts[0].strip()
-                    construct = parts[1].strip()
 
-                    # Track all unique files
-                    all_files.add(filename)
+def load_import_data(files):
+    """Load import data and count how many files use each import."""
+    file_ids = {}  # filename -> integer id
+    import_ids = {}  # import_name -> integer id
+    pair_files = []  # file id of each (import, file) line
+    pair_imports = []  # import id of each (import, file) line
 
-                    # Only process import constructs
-                    if construct.startswith('IMPORT_') or construct.startswith('IMPORT_FROM_'):
-                        # Store which file uses this import
-                        import_files[construct].add(filename)
+    for row in read_rows(files):
+        if len(row) >= 3:
+            filename = row[0]
+            construct = row[1]
 
-    return import_files, all_files
+            # Track all unique files
+            file_id = file_ids.setdefault(filename, len(file_ids))
 
+            # Only process import constructs (IMPORT_FROM_ shares the IMPORT_ prefix)
+            if construct.startswith('IMPORT_'):
+                # Store which file uses this import
+                pair_files.append(file_id)
+                pair_imports.append(import_ids.setdefault(construct, len(import_ids)))
+
+    # Count each (import, file) pair once, then the distinct files per import
+    total_files = len(file_ids)
+    pairs = np.unique(np.array(pair_imports, dtype=np.int64) * total_files
+                      + np.array(pair_files, dtype=np.int64))
+    file_counts = np.bincount(pairs // max(total_files, 1), minlength=len(import_ids))
+    import_file_counts = dict(zip(import_ids, file_counts.tolist()))
+
+    return import_file_counts, total_files
 
-def calculate_import_percentages(import_files, all_files):
-    """Calculate the percentage of files that use each import."""
-    total_files = len(all_files)
 
+def calculate_import_percentages(import_file_counts, total_files):
+    """Calculate the percentage of files that use each import."""
     if total_files == 0:
         return {}
 
     import_percentages = {}
-    for import_name, files in import_files.items():
-        percentage = (len(files) / total_files) * 100
+    for import_name, file_count in import_file_counts.items():
+        percentage = (file_count / total_files) * 100
         import_percentages[import_name] = {
             'percentage': percentage,
-            'file_count': len(files),
+            'file_count': file_count,
             'total_files': total_files
         }
 
@@ -53,18 +65,19 @@ def calculate_import_percentages(import_files, all_files):
 
 def format_import_label(import_name):
     """Format import names for display."""
-    # Remove IMPORT_ or IMPORT_FROM_ prefix
-    if import_name.startswith('IMPORT_FROM_'):
-        label = import_name.replace('IMPORT_FROM_', '')
+    match = IMPORT_LABEL_RE.match(import_name)
+    if not match:
+        return import_name.lower()
+
+    # Strip the IMPORT_ or IMPORT_FROM_ prefix
+    is_from, label = match.groups()
+    if is_from:
         # Format as "from module import name"
-        if '.' in label:
-            module, name = label.rsplit('.', 1)
+        module, _, name = label.rpartition('.')
+        if module:
             return f"from {module.lower()}\nimport {name.lower()}"
         return label.lower()
-    elif import_name.startswith('IMPORT_'):
-        label = import_name.replace('IMPORT_', '')
-        return f"import {label.lower()}"
-    return import_name.lower()
+    return f"import {label.lower()}"
 
 
 def create_import_popularity_chart(import_percentages, top_n=20):
@@ -84,10 +97,12 @@ def create_import_popularity_chart(import_percentages, top_n=20):
     file_counts = [data['file_count'] for _, data in sorted_imports]
 
     # Create color gradient from dark to light
-    colors = plt.cm.viridis([i / len(labels) for i in range(len(labels))])
+    colors = colormaps['viridis']([i / len(labels) for i in range(len(labels))])
 
     # Create figure
-    fig, ax = plt.subplots(figsize=(14, 10))
+    fig = Figure(figsize=(14, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
     # Create horizontal bar chart
     bars = ax.barh(range(len(labels)), percentages, color=colors,
@@ -101,11 +116,8 @@ def create_import_popularity_chart(import_percentages, top_n=20):
                  fontsize=14, fontweight='bold', pad=20)
 
     # Add percentage labels on bars
-    for i, (bar, pct, count) in enumerate(zip(bars, percentages, file_counts)):
-        width = bar.get_width()
-        ax.text(width, bar.get_y() + bar.get_height() / 2,
-                f' {pct:.1f}% ({count} files)',
-                ha='left', va='center', fontsize=9, fontweight='bold')
+    bar_labels = [f'{pct:.1f}% ({count} files)' for pct, count in zip(percentages, file_counts)]
+    ax.bar_label(bars, labels=bar_labels, padding=3, fontsize=9, fontweight='bold')
 
     # Add grid for readability
     ax.grid(axis='x', alpha=0.3, linestyle='--')
@@ -117,7 +129,7 @@ def create_import_popularity_chart(import_percentages, top_n=20):
     # Set x-axis limit to give space for labels
     ax.set_xlim(0, max(percentages) * 1.3)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -125,13 +137,14 @@ def main():
     # Load data from output files
     print("Loading import data from output files...")
     file_pattern = 'problemset/languagestructures/output/output-run1_part-*'
-    import_files, all_files = load_import_data(file_pattern)
+    files = list_outputs(file_pattern)
+    import_file_counts, total_files = load_import_data(files)
 
-    print(f"Found {len(all_files)} unique files")
-    print(f"Found {len(import_files)} unique imports")
+    print(f"Found {total_files} unique files")
+    print(f"Found {len(import_file_counts)} unique imports")
 
     # Calculate percentages
-    import_percentages = calculate_import_percentages(import_files, all_files)
+    import_percentages = calculate_import_percentages(import_file_counts, total_files)
 
     # Print top 10 imports
     print("\nTop 10 most popular imports:")
@@ -148,12 +161,9 @@ def main():
     if fig:
         # Save the figure
         output_path = 'problemset/languagestructures/analysis/import_popularity.png'
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"Chart saved to: {output_path}")
 
-        # Show the plot
-        plt.show()
-
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,35 @@
+"""
+Helpers shared by the languagestructures analysis scripts for reading reducer output parts.
+"""
+
+import csv
+import gzip
+import os
+
+
+def list_outputs(file_pattern):
+    """List the output part files matching a 'directory/prefix*' pattern."""
+    directory, prefix = os.path.split(file_pattern.rstrip('*'))
+    try:
+        entries = os.scandir(directory or '.')
+    except FileNotFoundError:
+        # Same as glob: a missing output directory simply has no parts
+        return ()
+    with entries:
+        return tuple(sorted(entry.path for entry in entries
+                            if entry.name.startswith(prefix) and entry.is_file()))
+
+
+def open_output(filepath):
+    """Open an output part file as text, decompressing gzipped parts."""
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, 'rt', newline='')
+    return open(filepath, 'r', newline='')
+
+
+def read_rows(files):
+    """Yield the tab-separated fields of every line in the given output files."""
+    for filepath in files:
+        with open_output(filepath) as f:
+            # Let the C csv reader split the tab-separated reducer output
+            yield from csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
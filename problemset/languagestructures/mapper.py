@@ -2,75 +2,107 @@
 import sys
 import ast
 import os
+from collections import defaultdict
 
 filename = os.environ.get("map_input_file", "unknown")
+# Encoded once and prefixed to every output line
+FNAME = (filename + "\t").encode()
 
-code = sys.stdin.read()
+# ast.parse takes bytes and honours the source's own encoding declaration
+code = sys.stdin.buffer.read()
 
 try:
     tree = ast.parse(code)
 except SyntaxError:
-    print(f"{filename}\tSYNTAX_ERROR\t1")
+    sys.stdout.buffer.write(FNAME + b"SYNTAX_ERROR\t1\n")
     sys.exit(0)
 
-# Walk through AST nodes
-for node in ast.walk(tree):
+# Counts constructs by dispatching on node type
+class ConstructCounter(ast.NodeVisitor):
+    counts: "defaultdict[str, int]"
+
+    def __init__(self) -> None:
+        self.counts = defaultdict(int)
 
     # Imports
-    if isinstance(node, ast.Import):
+    def visit_Import(self, node: ast.Import) -> None:
         # import os
         for alias in node.names:
-            print(f"{filename}\tIMPORT_{alias.name.upper()}\t1")
+            self.counts[f"IMPORT_{alias.name.upper()}"] += 1
+        self.generic_visit(node)
 
-    if isinstance(node, ast.ImportFrom):
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         # from math import sqrt
         module = node.module if node.module else "UNKNOWN_MODULE"
         for alias in node.names:
-            print(f"{filename}\tIMPORT_FROM_{module.upper()}.{alias.name.upper()}\t1")
+            self.counts[f"IMPORT_FROM_{module.upper()}.{alias.name.upper()}"] += 1
+        self.generic_visit(node)
 
     # Operators
-    if isinstance(node, ast.BinOp):
+    def visit_BinOp(self, node: ast.BinOp) -> None:
         # a + b, a - 1, a ** b, etc.
         op_type = type(node.op).__name__.upper()
-        print(f"{filename}\tOPERATOR_{op_type}\t1")
+        self.counts[f"OPERATOR_{op_type}"] += 1
+        self.generic_visit(node)
 
-    if isinstance(node, ast.BoolOp):
+    def visit_BoolOp(self, node: ast.BoolOp) -> None:
         # a and b, a or b, etc.
         op_type = type(node.op).__name__.upper()
-        print(f"{filename}\tBOOLEAN_OP_{op_type}\t1")
+        self.counts[f"BOOLEAN_OP_{op_type}"] += 1
+        self.generic_visit(node)
 
-    if isinstance(node, ast.UnaryOp):
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> None:
         # not a, etc.
         op_type = type(node.op).__name__.upper()
-        print(f"{filename}\tUNARY_OP_{op_type}\t1")
+        self.counts[f"UNARY_OP_{op_type}"] += 1
+        self.generic_visit(node)
 
-    if isinstance(node, ast.Compare):
+    def visit_Compare(self, node: ast.Compare) -> None:
         # ==, !=, >, <, etc.
         for op in node.ops:
             op_type = type(op).__name__.upper()
-            print(f"{filename}\tCOMPARE_OP_{op_type}\t1")
+            self.counts[f"COMPARE_OP_{op_type}"] += 1
+        self.generic_visit(node)
 
     # Control structures
-    if isinstance(node, ast.If):
-        # if/else
-        print(f"{filename}\tCONTROL_IF\t1")
+    def visit_If(self, node: ast.If) -> None:
+        # if/else, counted in the same visit so the walk stays single-pass
+        self.counts["CONTROL_IF"] += 1
         if node.orelse:
-            print(f"{filename}\tCONTROL_ELSE\t1")
-    if isinstance(node, ast.For):
+            self.counts["CONTROL_ELSE"] += 1
+        self.generic_visit(node)
+
+    def visit_For(self, node: ast.For) -> None:
         # for loop
-        print(f"{filename}\tCONTROL_FOR\t1")
-    if isinstance(node, ast.While):
+        self.counts["CONTROL_FOR"] += 1
+        self.generic_visit(node)
+
+    def visit_While(self, node: ast.While) -> None:
         # while loop
-        print(f"{filename}\tCONTROL_WHILE\t1")
+        self.counts["CONTROL_WHILE"] += 1
+        self.generic_visit(node)
 
     # Functions
-    if isinstance(node, ast.FunctionDef):
-        print(f"{filename}\tFUNCTION_DEF\t1")
-
-    # Data structures
-    if isinstance(node, ast.List):
-        print(f"{filename}\tDATA_LIST\t1")
-    if isinstance(node, ast.Dict):
-        print(f"{filename}\tDATA_DICT\t1")
-    if isinstance(node, ast.Set):
-        print(f"{filename}\tDATA_SET\t1")
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.counts["FUNCTION_DEF"] += 1
+        self.generic_visit(node)
+
+    # Data structures share one handler, keyed by node type
+    DATA_STRUCTURES = {
+        ast.List: "DATA_LIST",
+        ast.Dict: "DATA_DICT",
+        ast.Set: "DATA_SET",
+    }
+
+    def visit_data_structure(self, node: ast.expr) -> None:
+        self.counts[self.DATA_STRUCTURES[type(node)]] += 1
+        self.generic_visit(node)
+
+    visit_List = visit_Dict = visit_Set = visit_data_structure
+
+counter = ConstructCounter()
+counter.visit(tree)
+
+# One line per distinct construct; the reducer sums counts as before
+out = [FNAME + key.encode() + b"\t%d\n" % count for key, count in counter.counts.items()]
+sys.stdout.buffer.write(b"".join(out))
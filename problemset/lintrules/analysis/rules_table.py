@@ -5,10 +5,11 @@ Data source: flake8 lint output
 Reference: https://www.flake8rules.com/
 """
 
-import glob
+import csv
+import gzip
+import os
+import sys
 from collections import defaultdict
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
 
 # Comprehensive lint rule descriptions from flake8rules.com
 LINT_RULES = {
@@ -189,17 +190,37 @@ LINT_RULES = {
 }
 
 
-def load_lint_data(file_pattern):
+def _list_outputs(file_pattern):
+    """List the output part files matching a 'directory/prefix*' pattern."""
+    directory, prefix = os.path.split(file_pattern.rstrip('*'))
+    try:
+        entries = os.scandir(directory or '.')
+    except FileNotFoundError:
+        # Same as glob: a missing output directory simply has no parts
+        return ()
+    with entries:
+        return tuple(sorted(entry.path for entry in entries
+                            if entry.name.startswith(prefix) and entry.is_file()))
+
+
+def _open_output(filepath):
+    """Open an output part file as text, decompressing gzipped parts."""
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, 'rt', newline='')
+    return open(filepath, 'r', newline='')
+
+
+def load_lint_data(files):
     """Load lint rule data and count occurrences."""
     rule_counts = defaultdict(int)
 
-    for filepath in glob.glob(file_pattern):
-        with open(filepath, 'r') as f:
-            for line in f:
-                parts = line.strip().split('\t')
-                if len(parts) >= 3:
-                    construct = parts[1].strip()
-                    count = int(parts[2].strip())
+    for filepath in files:
+        with _open_output(filepath) as f:
+            # Let the C csv reader split the tab-separated reducer output
+            for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE):
+                if len(row) >= 3:
+                    construct = row[1]
+                    count = int(row[2])
 
                     # Extract rule code (remove LINT_ prefix)
                     if construct.startswith('LINT_'):
@@ -218,10 +239,11 @@ def create_rules_table(rule_counts, top_n=20):
         print("No lint data to display")
         return
 
-    # Print text table
-    print("\n" + "=" * 120)
-    print(f"{'Rank':<6}{'Rule':<8}{'Count':<8}{'Description':<40}{'Best Practice':<60}")
-    print("=" * 120)
+    # Build the text table and print it with a single write
+    separator = "=" * 120
+    lines = ["", separator,
+             f"{'Rank':<6}{'Rule':<8}{'Count':<8}{'Description':<40}{'Best Practice':<60}",
+             separator]
 
     for rank, (rule_code, count) in enumerate(sorted_rules, 1):
         rule_info = LINT_RULES.get(rule_code, {
@@ -234,16 +256,23 @@ def create_rules_table(rule_counts, top_n=20):
         name = rule_info['name'][:38]
         fix = rule_info['fix'][:58]
 
-        print(f"{rank:<6}{rule_code:<8}{count:<8}{name:<40}{fix:<60}")
+        lines.append(f"{rank:<6}{rule_code:<8}{count:<8}{name:<40}{fix:<60}")
 
-    print("=" * 120 + "\n")
+    lines += [separator, ""]
+    sys.stdout.write("\n".join(lines) + "\n")
 
     return sorted_rules
 
 
 def create_visual_table(sorted_rules):
     """Create a visual matplotlib table."""
-    fig, ax = plt.subplots(figsize=(18, 12))
+    # Imported here so the text table and report don't pay matplotlib's startup cost
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(18, 12))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
     ax.axis('tight')
     ax.axis('off')
 
@@ -305,36 +334,43 @@ def create_visual_table(sorted_rules):
                 cell.set_text_props(weight='bold')
 
     # Title
-    plt.title('Top 20 Most Common Flake8 Lint Rules\n(with descriptions and best practices)',
-              fontsize=16, fontweight='bold', pad=20)
+    ax.set_title('Top 20 Most Common Flake8 Lint Rules\n(with descriptions and best practices)',
+                 fontsize=16, fontweight='bold', pad=20)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
 def create_detailed_report(sorted_rules, output_file='lint_rules_detailed.txt'):
     """Create a detailed text report with full descriptions."""
+    # Collect the whole report and write it in one call
+    chunks = [
+        "=" * 100 + "\n",
+        "DETAILED LINT RULES REPORT\n",
+        "Top 20 Most Common Flake8 Lint Rules\n",
+        "=" * 100 + "\n\n",
+    ]
+
+    for rank, (rule_code, count) in enumerate(sorted_rules, 1):
+        rule_info = LINT_RULES.get(rule_code, {
+            'name': 'Unknown rule',
+            'explanation': 'No description available',
+            'example': 'N/A',
+            'fix': 'Refer to flake8 documentation'
+        })
+
+        chunks += [
+            f"{'=' * 100}\n",
+            f"#{rank} - {rule_code}: {rule_info['name']}\n",
+            f"{'=' * 100}\n",
+            f"Occurrences: {count:,}\n\n",
+            f"EXPLANATION:\n{rule_info['explanation']}\n\n",
+            f"EXAMPLE:\n{rule_info['example']}\n\n",
+            f"BEST PRACTICE:\n{rule_info['fix']}\n\n",
+        ]
+
     with open(output_file, 'w') as f:
-        f.write("=" * 100 + "\n")
-        f.write("DETAILED LINT RULES REPORT\n")
-        f.write("Top 20 Most Common Flake8 Lint Rules\n")
-        f.write("=" * 100 + "\n\n")
-
-        for rank, (rule_code, count) in enumerate(sorted_rules, 1):
-            rule_info = LINT_RULES.get(rule_code, {
-                'name': 'Unknown rule',
-                'explanation': 'No description available',
-                'example': 'N/A',
-                'fix': 'Refer to flake8 documentation'
-            })
-
-            f.write(f"{'=' * 100}\n")
-            f.write(f"#{rank} - {rule_code}: {rule_info['name']}\n")
-            f.write(f"{'=' * 100}\n")
-            f.write(f"Occurrences: {count:,}\n\n")
-            f.write(f"EXPLANATION:\n{rule_info['explanation']}\n\n")
-            f.write(f"EXAMPLE:\n{rule_info['example']}\n\n")
-            f.write(f"BEST PRACTICE:\n{rule_info['fix']}\n\n")
+        f.write(''.join(chunks))
 
     return output_file
 
@@ -343,7 +379,8 @@ def main():
     # Load data from output files
     print("Loading lint rule data from output files...")
     file_pattern = 'problemset/lintrules/output/output-run3_part-*'
-    rule_counts = load_lint_data(file_pattern)
+    files = _list_outputs(file_pattern)
+    rule_counts = load_lint_data(files)
 
     print(f"Found {len(rule_counts)} unique lint rules")
     print(f"Total violations: {sum(rule_counts.values()):,}")
@@ -357,7 +394,7 @@ def main():
         fig = create_visual_table(sorted_rules)
 
         output_path = 'problemset/lintrules/analysis/rules_table.png'
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        fig.savefig(output_path, dpi=300, bbox_inches='tight')
         print(f"Visual table saved to: {output_path}")
 
         # Create detailed report
@@ -366,8 +403,6 @@ def main():
         create_detailed_report(sorted_rules, report_path)
         print(f"Detailed report saved to: {report_path}")
 
-        plt.show()
-
 
 if __name__ == '__main__':
     main()
@@ -1,22 +1,45 @@
 #!/usr/bin/env python3
 import sys
 import os
+import re
 import subprocess
-import tempfile
+
+try:
+    from flake8.api import legacy as flake8_api
+except ImportError:
+    flake8_api = None
 
 filename = os.environ.get("map_input_file", "unknown")
 
-code = sys.stdin.read()
+FLAKE8_PATH = "/opt/conda/default/bin/flake8"
+# "stdin:LINE:COL: CODE message" -> CODE
+ERROR_CODE_RE = re.compile(r":\d+:\d+:\s+(\S+)\s")
+
+if flake8_api is not None:
+    # Run flake8 in-process on stdin ("-") instead of forking it per file;
+    # quiet=2 keeps its own report off our stdout
+    try:
+        style_guide = flake8_api.get_style_guide(quiet=2)
+        report = style_guide.check_files(["-"])
+    except Exception as e:
+        print(f"{filename}\tLINT_ERROR_FLAKE8_FAILED\t{repr(e)}")
+        sys.exit(0)
 
-with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as tmp:
-    tmp.write(code)
-    tmp_filename = tmp.name
+    # Statistics are "{count} {code} {message}", one per distinct violation
+    out = []
+    for stat in report.get_statistics(""):
+        count, error_code, _ = stat.split(" ", 2)
+        out.append(f"{filename}\tLINT_{error_code}\t{count}\n")
+    sys.stdout.write("".join(out))
+    sys.exit(0)
 
-FLAKE8_PATH = "/opt/conda/default/bin/flake8"
+code = sys.stdin.read()
 
 try:
+    # flake8 reads the source from stdin when given "-", so no temp file
     result = subprocess.run(
-        [FLAKE8_PATH, tmp_filename],
+        [FLAKE8_PATH, "-"],
+        input=code,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
@@ -26,14 +49,11 @@ except Exception as e:
     sys.exit(0)
 
 # Extract error code (F401, E302, etc.) from flake8 output
-for line in result.stdout.splitlines():
+out = []
+for line in result.stdout.split("\n"):
     if not line.strip():
         continue
-    try:
-        # Split into filename, line, column, and message
-        _, _, _, msg = line.split(":", 3)
-        # Only the error code is relevant
-        error_code = msg.strip().split()[0]
-        print(f"{filename}\tLINT_{error_code}\t1")
-    except Exception:
-        print(f"{filename}\tLINT_UNKNOWN\t1")
+    match = ERROR_CODE_RE.search(line)
+    error_code = match.group(1) if match else "UNKNOWN"
+    out.append(f"{filename}\tLINT_{error_code}\t1\n")
+sys.stdout.write("".join(out))
@@ -4,75 +4,131 @@ Analyze correlations between different programming errors.
 Shows which errors tend to occur together in the same files.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 from collections import defaultdict
+from itertools import chain
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import glob
+import gzip
+import os
+
+# Larger heatmaps are drawn without per-cell value labels
+MAX_ANNOTATED_ERRORS = 20
+
+# Below this much output, starting worker processes costs more than parsing serially
+PARALLEL_MIN_BYTES = 64 << 20
+
+
+def _open_output(filepath):
+    """Open an output part file as text, decompressing gzipped parts."""
+    if filepath.endswith('.gz'):
+        return gzip.open(filepath, 'rt')
+    return open(filepath, 'r', buffering=1 << 20)
+
+
+def _load_error_file(filepath):
+    """Load one output file's error data (runs in a worker process)."""
+    file_errors = defaultdict(set)  # filename -> set of error ids
+    error_id = {}  # error type -> small int id, local to this file
+
+    with _open_output(filepath) as f:
+        for line in f:
+            # Locate the first two tabs instead of splitting the whole line
+            tab1 = line.find('\t')
+            tab2 = line.find('\t', tab1 + 1)
+            if tab1 < 0 or tab2 < 0:
+                continue
+            construct = line[tab1 + 1:tab2]
+
+            # Only process error and warning constructs
+            if construct.startswith(('ERROR_', 'WARNING_')):
+                # Normalize undefined variable errors to a single category
+                if construct.startswith('ERROR_NAME_UNDEFINED_'):
+                    construct = 'ERROR_NAME_UNDEFINED'
+
+                filename = line[:tab1]
+                file_errors[filename].add(error_id.setdefault(construct, len(error_id)))
+
+    return file_errors, list(error_id)
+
+
+def _parse_parts(files):
+    """Yield each output file's error data, using worker processes only for large outputs."""
+    workers = min(os.cpu_count() or 1, len(files))
+    if workers > 1 and sum(map(os.path.getsize, files)) >= PARALLEL_MIN_BYTES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(_load_error_file, files)
+    else:
+        yield from map(_load_error_file, files)
 
 
 def load_error_data(file_pattern):
     """Load error data and track which files have which errors."""
-    file_errors = defaultdict(set)  # filename -> set of error types
-    all_errors = set()
-
-    for filepath in glob.glob(file_pattern):
-        with open(filepath, 'r') as f:
-            for line in f:
-                parts = line.strip().split('\t')
-                if len(parts) >= 3:
-                    filename = parts[0].strip()
-                    construct = parts[1].strip()
+    # Files hold small int ids rather than error strings; error_names maps an id back to its name
+    file_errors = defaultdict(set)  # filename -> set of error ids
+    error_id = {}
+    error_names = []
 
-                    # Only process error and warning constructs
-                    if construct.startswith('ERROR_') or construct.startswith('WARNING_'):
-                        # Normalize undefined variable errors to a single category
-                        if construct.startswith('ERROR_NAME_UNDEFINED_'):
-                            construct = 'ERROR_NAME_UNDEFINED'
+    # Output files are independent, so parse them separately and merge the results
+    for part_errors, part_names in _parse_parts(glob.glob(file_pattern)):
+        # Translate the part's local ids into the shared id table
+        remap = []
+        for name in part_names:
+            if name not in error_id:
+                error_id[name] = len(error_names)
+                error_names.append(name)
+            remap.append(error_id[name])
 
-                        file_errors[filename].add(construct)
-                        all_errors.add(construct)
+        for filename, errors in part_errors.items():
+            file_errors[filename].update(remap[e] for e in errors)
 
-    return file_errors, all_errors
+    return file_errors, error_names
 
 
-def calculate_correlation_matrix(file_errors, all_errors):
+def calculate_correlation_matrix(file_errors, error_names):
     """Calculate correlation matrix between different error types."""
-    error_list = sorted(list(all_errors))
+    error_list = sorted(error_names)
     n = len(error_list)
 
-    # Create a matrix to count co-occurrences
-    co_occurrence = np.zeros((n, n), dtype=int)
-    error_counts = defaultdict(int)
-
-    # Count occurrences and co-occurrences
-    for filename, errors in file_errors.items():
-        for error in errors:
-            error_counts[error] += 1
-
-        # Count co-occurrences
-        for i, error1 in enumerate(error_list):
-            for j, error2 in enumerate(error_list):
-                if error1 in errors and error2 in errors:
-                    co_occurrence[i, j] += 1
-
-    # Calculate correlation coefficients (Jaccard similarity)
-    correlation = np.zeros((n, n))
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                correlation[i, j] = 1.0
-            else:
-                # Jaccard similarity: intersection / union
-                intersection = co_occurrence[i, j]
-                union = error_counts[error_list[i]] + error_counts[error_list[j]] - intersection
-                if union > 0:
-                    correlation[i, j] = intersection / union
-                else:
-                    correlation[i, j] = 0
+    # Columns follow the sorted error names, so map each error id to its column
+    error_index = {error: i for i, error in enumerate(error_list)}
+    id_column = np.array([error_index[error] for error in error_names], dtype=np.intp)
+
+    # Indicator matrix: one row per file, a 1 in each column whose error the file has.
+    # Row and column indices are built as arrays, without per-entry Python lists
+    error_sets = list(file_errors.values())
+    sizes = np.fromiter(map(len, error_sets), dtype=np.intp, count=len(error_sets))
+    rows = np.repeat(np.arange(len(error_sets)), sizes)
+    cols = id_column[np.fromiter(chain.from_iterable(error_sets), dtype=np.intp, count=sizes.sum())]
+
+    # Float so the product goes through BLAS (NumPy has no BLAS path for integer matmul);
+    # float32 holds counts exactly up to 2**24 files, float64 up to 2**53
+    dtype = np.float32 if len(error_sets) < 2 ** 24 else np.float64
+    indicator = np.zeros((len(error_sets), n), dtype=dtype)
+    indicator[rows, cols] = 1
+
+    # Count co-occurrences with one matrix product; the diagonal holds each error's file count
+    co_occurrence = (indicator.T @ indicator).astype(np.int64)
+    counts = np.diag(co_occurrence)
+    error_counts = dict(zip(error_list, counts.tolist()))
+
+    # Calculate correlation coefficients (Jaccard similarity: intersection / union)
+    # The product above is the full matrix; only the Jaccard division is limited to the strict
+    # upper triangle, whose values are then mirrored
+    upper_i, upper_j = np.triu_indices(n, k=1)
+    intersection = co_occurrence[upper_i, upper_j]
+    union = counts[upper_i] + counts[upper_j] - intersection
+    values = np.divide(intersection, union, out=np.zeros(len(intersection)), where=union > 0)
+
+    correlation = np.eye(n)
+    correlation[upper_i, upper_j] = values
+    correlation[upper_j, upper_i] = values
 
     return correlation, error_list, error_counts
 
 
+@lru_cache(maxsize=None)
 def format_error_label(error_name):
     """Format error names for display."""
     # Remove ERROR_ or WARNING_ prefix
@@ -86,6 +142,10 @@ def format_error_label(error_name):
 
 def create_correlation_heatmap(correlation, error_list, error_counts):
     """Create a heatmap showing correlations between errors."""
+    # Imported here so parser worker processes never load matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
     if len(error_list) == 0:
         print("No error data to visualize")
         return
@@ -95,10 +155,13 @@ def create_correlation_heatmap(correlation, error_list, error_counts):
 
     # Create figure with appropriate size
     fig_size = max(10, len(error_list) * 0.8)
-    fig, ax = plt.subplots(figsize=(fig_size, fig_size))
+    fig = Figure(figsize=(fig_size, fig_size))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
     # Create heatmap
-    im = ax.imshow(correlation, cmap='YlOrRd', aspect='auto', vmin=0, vmax=1)
+    im = ax.imshow(correlation, cmap='YlOrRd', aspect='auto', vmin=0, vmax=1,
+                   interpolation='nearest', rasterized=True)
 
     # Set ticks and labels
     ax.set_xticks(range(len(error_list)))
@@ -107,16 +170,18 @@ def create_correlation_heatmap(correlation, error_list, error_counts):
     ax.set_yticklabels(labels, fontsize=9)
 
     # Add colorbar
-    cbar = plt.colorbar(im, ax=ax)
+    cbar = fig.colorbar(im, ax=ax)
     cbar.set_label('Correlation Coefficient\n(Jaccard Similarity)', rotation=270, labelpad=20, fontsize=11)
 
-    # Add correlation values in cells
-    for i in range(len(error_list)):
-        for j in range(len(error_list)):
-            if i != j and correlation[i, j] > 0.05:  # Only show significant correlations
-                text = ax.text(j, i, f'{correlation[i, j]:.2f}',
-                               ha='center', va='center', color='black' if correlation[i, j] < 0.5 else 'white',
-                               fontsize=8, fontweight='bold')
+    # Add correlation values in cells, only for significant correlations and
+    # only while the matrix is small enough for the numbers to be readable
+    if len(error_list) <= MAX_ANNOTATED_ERRORS:
+        significant = correlation > 0.05
+        np.fill_diagonal(significant, False)
+        for i, j in zip(*np.nonzero(significant)):
+            ax.text(j, i, f'{correlation[i, j]:.2f}',
+                    ha='center', va='center', color='black' if correlation[i, j] < 0.5 else 'white',
+                    fontsize=8, fontweight='bold')
 
     # Title
     ax.set_title('Programming Error Correlations\n(Shows which errors tend to occur together)',
@@ -127,64 +192,68 @@ def create_correlation_heatmap(correlation, error_list, error_counts):
     ax.set_yticks(np.arange(len(error_list)) - 0.5, minor=True)
     ax.grid(which='minor', color='white', linestyle='-', linewidth=2)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
 def print_top_correlations(correlation, error_list, top_n=10):
     """Print the top correlated error pairs."""
-    correlations_list = []
-
-    for i in range(len(error_list)):
-        for j in range(i + 1, len(error_list)):  # Only upper triangle to avoid duplicates
-            if correlation[i, j] > 0:
-                correlations_list.append((error_list[i], error_list[j], correlation[i, j]))
-
-    # Sort by correlation coefficient
-    correlations_list.sort(key=lambda x: x[2], reverse=True)
+    # Only upper triangle to avoid duplicates
+    upper_i, upper_j = np.triu_indices(len(error_list), k=1)
+    values = correlation[upper_i, upper_j]
+    positive = values > 0
+    upper_i, upper_j, values = upper_i[positive], upper_j[positive], values[positive]
+
+    # Select the top N in linear time, then sort only those (ties keep matrix order)
+    top = np.arange(len(values))
+    if 0 < top_n < len(values):
+        cutoff = -np.partition(-values, top_n - 1)[top_n - 1]
+        above = np.flatnonzero(values > cutoff)
+        tied = np.flatnonzero(values == cutoff)[:top_n - len(above)]
+        top = np.concatenate((above, tied))
+    order = top[np.lexsort((top, -values[top]))][:top_n]
 
     print(f"\nTop {top_n} correlated error pairs:")
-    for i, (err1, err2, corr) in enumerate(correlations_list[:top_n], 1):
-        print(f"  {i}. {format_error_label(err1)} <-> {format_error_label(err2)}: {corr:.3f}")
+    for rank, k in enumerate(order, 1):
+        err1, err2 = error_list[upper_i[k]], error_list[upper_j[k]]
+        print(f"  {rank}. {format_error_label(err1)} <-> {format_error_label(err2)}: {values[k]:.3f}")
 
 
 def create_network_graph(correlation, error_list, error_counts, threshold=0.2):
     """Create a network graph showing strong correlations."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
     import matplotlib.patches as mpatches
 
-    fig, ax = plt.subplots(figsize=(14, 10))
+    fig = Figure(figsize=(14, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
-    # Filter errors with significant correlations
+    # Arrange nodes in a circle; node i sits at (xs[i], ys[i])
     n = len(error_list)
-    positions = {}
-
-    # Arrange nodes in a circle
     angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
     radius = 3
-    for i, error in enumerate(error_list):
-        positions[error] = (radius * np.cos(angles[i]), radius * np.sin(angles[i]))
-
-    # Draw edges for correlations above threshold
-    for i in range(n):
-        for j in range(i + 1, n):
-            if correlation[i, j] > threshold:
-                x1, y1 = positions[error_list[i]]
-                x2, y2 = positions[error_list[j]]
-
-                # Line thickness based on correlation strength
-                linewidth = correlation[i, j] * 5
-                alpha = min(correlation[i, j] + 0.3, 0.9)
-
-                ax.plot([x1, x2], [y1, y2], 'b-', linewidth=linewidth, alpha=alpha, zorder=1)
-
-    # Draw nodes
-    for error in error_list:
-        x, y = positions[error]
-        # Node size based on error frequency
-        size = np.sqrt(error_counts[error]) * 50
-        ax.scatter(x, y, s=size, c='red', alpha=0.7, edgecolors='darkred', linewidth=2, zorder=2)
-
-        # Add label
+    xs = radius * np.cos(angles)
+    ys = radius * np.sin(angles)
+
+    # Draw edges for correlations above threshold as a single collection
+    ii, jj = np.nonzero(np.triu(correlation, k=1) > threshold)
+    strengths = correlation[ii, jj]
+    segments = np.stack((np.column_stack((xs[ii], ys[ii])), np.column_stack((xs[jj], ys[jj]))), axis=1)
+
+    # Line thickness and opacity based on correlation strength
+    colors = np.zeros((len(strengths), 4))
+    colors[:, 2] = 1
+    colors[:, 3] = np.minimum(strengths + 0.3, 0.9)
+    ax.add_collection(LineCollection(segments, linewidths=strengths * 5, colors=colors, zorder=1))
+
+    # Draw nodes in one call, sized by error frequency
+    sizes = np.sqrt([error_counts[error] for error in error_list]) * 50
+    ax.scatter(xs, ys, s=sizes, c='red', alpha=0.7, edgecolors='darkred', linewidth=2, zorder=2)
+
+    # Add labels
+    for x, y, error in zip(xs, ys, error_list):
         label = format_error_label(error)
         ax.text(x * 1.15, y * 1.15, label, ha='center', va='center', fontsize=9,
                 fontweight='bold', bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
@@ -196,8 +265,8 @@ def create_network_graph(correlation, error_list, error_counts, threshold=0.2):
     ax.axis('off')
 
     # Title
-    plt.title(f'Programming Error Network\n(Edges show correlations > {threshold:.1%})',
-              fontsize=14, fontweight='bold', pad=20)
+    ax.set_title(f'Programming Error Network\n(Edges show correlations > {threshold:.1%})',
+                 fontsize=14, fontweight='bold', pad=20)
 
     # Legend
     legend_elements = [
@@ -206,7 +275,7 @@ def create_network_graph(correlation, error_list, error_counts, threshold=0.2):
     ]
     ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
 
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
@@ -214,14 +283,14 @@ def main():
     # Load data from output files
     print("Loading error data from output files...")
     file_pattern = 'problemset/programmingerrors/output/output-run2_part-*'
-    file_errors, all_errors = load_error_data(file_pattern)
+    file_errors, error_names = load_error_data(file_pattern)
 
     print(f"Found {len(file_errors)} files with errors")
-    print(f"Found {len(all_errors)} unique error types")
+    print(f"Found {len(error_names)} unique error types")
 
     # Calculate correlation matrix
     print("\nCalculating error correlations...")
-    correlation, error_list, error_counts = calculate_correlation_matrix(file_errors, all_errors)
+    correlation, error_list, error_counts = calculate_correlation_matrix(file_errors, error_names)
 
     # Print error frequencies
     print("\nError frequencies:")
@@ -237,7 +306,7 @@ def main():
 
     if fig1:
         output_path1 = 'problemset/programmingerrors/analysis/correlation_heatmap.png'
-        plt.savefig(output_path1, dpi=300, bbox_inches='tight')
+        fig1.savefig(output_path1, dpi=300, bbox_inches='tight')
         print(f"Heatmap saved to: {output_path1}")
 
     # Create network graph
@@ -246,11 +315,9 @@ def main():
 
     if fig2:
         output_path2 = 'problemset/programmingerrors/analysis/correlation_network.png'
-        plt.savefig(output_path2, dpi=300, bbox_inches='tight')
+        fig2.savefig(output_path2, dpi=300, bbox_inches='tight')
         print(f"Network graph saved to: {output_path2}")
 
-    plt.show()
-
 
 if __name__ == '__main__':
     main()
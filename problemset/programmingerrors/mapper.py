@@ -2,9 +2,14 @@
 import sys
 import ast
 import os
+import builtins
+from collections import Counter
 
 filename = os.environ.get("map_input_file", "unknown")
 
+# Built-in names are never reported as undefined
+BUILTINS = frozenset(dir(builtins))
+
 code = sys.stdin.read()
 
 try:
@@ -15,8 +20,12 @@ except SyntaxError:
 
 # Find undefined variable names
 defined_names = set()
-used_names = []
+used_names = Counter()  # name -> number of loads
+
+# Error counts for this file, emitted once at the end
+counts = Counter()
 
+# Collects names and structural errors in a single pass over the AST
 class NameCollector(ast.NodeVisitor):
     def visit_Assign(self, node):
         # builds list of defined variables
@@ -28,49 +37,53 @@ class NameCollector(ast.NodeVisitor):
     def visit_Name(self, node):
         # builds list of named variables
         if isinstance(node.ctx, ast.Load):
-            used_names.append(node.id)
+            used_names[node.id] += 1
         self.generic_visit(node)
 
-collector = NameCollector()
-collector.visit(tree)
-
-# Check named but undefined variables
-for name in used_names:
-    if name not in defined_names and not hasattr(__builtins__, name):
-        print(f"{filename}\tERROR_NAME_UNDEFINED_{name.upper()}\t1")
-
-# Walk through AST nodes for structural errors
-for node in ast.walk(tree):
-
-    # Bare except (handles every possible exception)
-    if isinstance(node, ast.ExceptHandler) and node.type is None:
-        print(f"{filename}\tERROR_BARE_EXCEPT\t1")
-
-    # Empty except (pass on except)
-    if isinstance(node, ast.ExceptHandler) and len(node.body) == 0:
-        print(f"{filename}\tERROR_EMPTY_EXCEPT\t1")
+    def visit_ExceptHandler(self, node):
+        # Bare except (handles every possible exception)
+        if node.type is None:
+            counts["ERROR_BARE_EXCEPT"] += 1
+        # Empty except (pass on except)
+        if len(node.body) == 0:
+            counts["ERROR_EMPTY_EXCEPT"] += 1
+        self.generic_visit(node)
 
-    # Dividing by zero
-    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div):
-        if isinstance(node.right, ast.Constant) and node.right.value == 0:
-            print(f"{filename}\tERROR_DIV_BY_ZERO\t1")
+    def visit_BinOp(self, node):
+        # Dividing by zero
+        if isinstance(node.op, ast.Div):
+            if isinstance(node.right, ast.Constant) and node.right.value == 0:
+                counts["ERROR_DIV_BY_ZERO"] += 1
+        self.generic_visit(node)
 
-    # Useless "pass" block
-    if isinstance(node, ast.Pass):
-        print(f"{filename}\tERROR_USELESS_PASS\t1")
+    def visit_Pass(self, node):
+        # Useless "pass" block
+        counts["ERROR_USELESS_PASS"] += 1
 
-    # Unreachable code after the return statement of a function
-    if isinstance(node, ast.FunctionDef):
+    def visit_FunctionDef(self, node):
+        # Unreachable code after the return statement of a function
         found_return = False
         for stmt in node.body:
             if isinstance(stmt, ast.Return):
                 found_return = True
                 continue
             if found_return:
-                print(f"{filename}\tERROR_UNREACHABLE_CODE\t1")
+                counts["ERROR_UNREACHABLE_CODE"] += 1
                 break
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        # print() used for debugging
+        if isinstance(node.func, ast.Name) and node.func.id == "print":
+            counts["WARNING_PRINT_USED"] += 1
+        self.generic_visit(node)
+
+collector = NameCollector()
+collector.visit(tree)
+
+# Check named but undefined variables, counting every use
+for name in used_names.keys() - defined_names - BUILTINS:
+    counts[f"ERROR_NAME_UNDEFINED_{name.upper()}"] += used_names[name]
 
-    # print() used for debugging
-    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-        if node.func.id == "print":
-            print(f"{filename}\tWARNING_PRINT_USED\t1")
\ No newline at end of file
+# One line per distinct error; the reducer sums counts as before
+sys.stdout.write("".join(f"{filename}\t{key}\t{count}\n" for key, count in counts.items()))
@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 import sys
 
+FLUSH_SIZE = 1 << 16  # write output in 64KB chunks
+
 current_key = None
 current_count = 0
+out = bytearray()
 
-for line in sys.stdin:
+# Work on raw bytes: no decoding on input and no encoding on output
+for line in sys.stdin.buffer:
     line = line.strip()
     if not line:
         continue
 
-    parts = line.split("\t")
+    parts = line.split(b"\t")
     if len(parts) != 3:
         continue
 
@@ -26,9 +30,13 @@ for line in sys.stdin:
         current_count += count
     else:
         if current_key is not None:
-            print(f"{current_key[0]}\t{current_key[1]}\t{current_count}")
+            out += b"%s\t%s\t%d\n" % (current_key[0], current_key[1], current_count)
+            if len(out) >= FLUSH_SIZE:
+                sys.stdout.buffer.write(out)
+                out.clear()
         current_key = key
         current_count = count
 
 if current_key is not None:
-    print(f"{current_key[0]}\t{current_key[1]}\t{current_count}")
+    out += b"%s\t%s\t%d\n" % (current_key[0], current_key[1], current_count)
+sys.stdout.buffer.write(out)
@@ -3,7 +3,8 @@
 Box-and-whisker plot of line counts from MapReduce output files.
 """
 
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import numpy as np
 import os
 
@@ -32,9 +33,11 @@ for output_file in output_files:
                     count = int(parts[1])
                     line_counts.append(count)
 
-# Calculate statistics for outlier detection
-q1 = np.percentile(line_counts, 25)
-q3 = np.percentile(line_counts, 75)
+# Convert once; every statistic below works on this array
+line_counts = np.fromiter(line_counts, dtype=np.int64, count=len(line_counts))
+
+# Calculate statistics for outlier detection (both quartiles from one call)
+q1, q3 = np.percentile(line_counts, [25, 75])
 iqr = q3 - q1
 
 # Define outlier bounds using IQR method (1.5 * IQR)
@@ -42,14 +45,15 @@ lower_bound = q1 - 1.5 * iqr
 upper_bound = q3 + 1.5 * iqr
 
 # Identify outliers and non-outliers
-outliers = [x for x in line_counts if x < lower_bound or x > upper_bound]
-trimmed_counts = [x for x in line_counts if lower_bound <= x <= upper_bound]
+in_bounds = (line_counts >= lower_bound) & (line_counts <= upper_bound)
+outliers = line_counts[~in_bounds]
+trimmed_counts = line_counts[in_bounds]
 
 # Calculate statistics on all data
 mean_lines_all = np.mean(line_counts)
 median_lines_all = np.median(line_counts)
-max_lines = max(line_counts)
-min_lines = min(line_counts)
+max_lines = line_counts.max()
+min_lines = line_counts.min()
 total_files = len(line_counts)
 
 # Calculate statistics on trimmed data
@@ -57,18 +61,20 @@ mean_lines_trimmed = np.mean(trimmed_counts)
 median_lines_trimmed = np.median(trimmed_counts)
 
 # Create the box-and-whisker plot with trimmed data (horizontal)
-plt.figure(figsize=(12, 6))
-bp = plt.boxplot(trimmed_counts, vert=False, patch_artist=True,
-                 notch=True, showmeans=True,
-                 boxprops=dict(facecolor='steelblue', alpha=0.7),
-                 meanprops=dict(marker='D', markerfacecolor='red', markersize=8),
-                 medianprops=dict(color='darkblue', linewidth=2),
-                 whiskerprops=dict(linewidth=1.5),
-                 capprops=dict(linewidth=1.5))
-
-plt.xlabel('Line Count', fontsize=12)
-plt.title('Distribution of Line Counts, P00018 (Outliers Trimmed)', fontsize=14, fontweight='bold')
-plt.grid(axis='x', alpha=0.3, linestyle='--')
+fig = Figure(figsize=(12, 6))
+FigureCanvasAgg(fig)
+ax = fig.add_subplot()
+bp = ax.boxplot(trimmed_counts, vert=False, patch_artist=True,
+                notch=True, showmeans=True,
+                boxprops=dict(facecolor='steelblue', alpha=0.7),
+                meanprops=dict(marker='D', markerfacecolor='red', markersize=8),
+                medianprops=dict(color='darkblue', linewidth=2),
+                whiskerprops=dict(linewidth=1.5),
+                capprops=dict(linewidth=1.5))
+
+ax.set_xlabel('Line Count', fontsize=12)
+ax.set_title('Distribution of Line Counts, P00018 (Outliers Trimmed)', fontsize=14, fontweight='bold')
+ax.grid(axis='x', alpha=0.3, linestyle='--')
 
 # Add statistics to the plot
 num_outliers = len(outliers)
@@ -80,25 +86,22 @@ stats_text += f'Median: {median_lines_trimmed:.2f} lines\n'
 stats_text += f'Q1: {q1:.2f} lines\n'
 stats_text += f'Q3: {q3:.2f} lines\n'
 stats_text += f'IQR: {iqr:.2f} lines\n'
-stats_text += f'Trimmed Range: {min(trimmed_counts)}-{max(trimmed_counts)} lines'
+stats_text += f'Trimmed Range: {trimmed_counts.min()}-{trimmed_counts.max()} lines'
 
-plt.text(0.98, 0.95, stats_text, transform=plt.gca().transAxes,
-         fontsize=10, verticalalignment='top', horizontalalignment='right',
-         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+ax.text(0.98, 0.95, stats_text, transform=ax.transAxes,
+        fontsize=10, verticalalignment='top', horizontalalignment='right',
+        bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
 # Remove y-axis labels since there's only one box
-plt.yticks([1], ['All Files'])
+ax.set_yticks([1], ['All Files'])
 
-plt.tight_layout()
+fig.tight_layout()
 
 # Save the box plot
 output_path = os.path.join(script_dir, 'line_count_boxplot.png')
-plt.savefig(output_path, dpi=300, bbox_inches='tight')
+fig.savefig(output_path, dpi=300, bbox_inches='tight')
 print(f"Box-and-whisker plot saved to: {output_path}")
 
-# Display the box plot
-plt.show()
-
 # Print summary statistics
 print(f"\nSummary Statistics (All Data):")
 print(f"Total files: {total_files}")
@@ -115,19 +118,15 @@ print(f"Median line count: {median_lines_trimmed:.2f}")
 print(f"Q1 (25th percentile): {q1:.2f}")
 print(f"Q3 (75th percentile): {q3:.2f}")
 print(f"IQR (Interquartile Range): {iqr:.2f}")
-print(f"Trimmed range: {min(trimmed_counts)}-{max(trimmed_counts)} lines")
+print(f"Trimmed range: {trimmed_counts.min()}-{trimmed_counts.max()} lines")
 
-if outliers:
+if outliers.size:
     print(f"\nOutliers (removed from plot):")
-    from collections import Counter
-
-    outlier_freq = Counter(outliers)
-    for count in sorted(outlier_freq.keys()):
-        print(f"  {count} lines: {outlier_freq[count]} files")
+    outlier_values, outlier_freq = np.unique(outliers, return_counts=True)
+    for count, freq in zip(outlier_values, outlier_freq):
+        print(f"  {count} lines: {freq} files")
 
 print(f"\nLine count distribution (trimmed data):")
-from collections import Counter
-
-count_freq = Counter(trimmed_counts)
-for count in sorted(count_freq.keys()):
-    print(f"  {count} lines: {count_freq[count]} files")
+count_values, count_freq = np.unique(trimmed_counts, return_counts=True)
+for count, freq in zip(count_values, count_freq):
+    print(f"  {count} lines: {freq} files")
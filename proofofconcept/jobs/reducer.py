@@ -1,20 +1,28 @@
 import sys
 
+FLUSH_SIZE = 1 << 16  # write output in 64KB chunks
+
 current_file = None
 count = 0
+out = bytearray()
 
-for line in sys.stdin:
-    file, value = line.strip().split("\t")
+# Work on raw bytes: no decoding on input and no encoding on output
+for line in sys.stdin.buffer:
+    file, value = line.strip().split(b"\t")
 
     if current_file != file:
         if current_file is not None:
-            print(f"{current_file}\t{count}")
+            out += b"%s\t%d\n" % (current_file, count)
+            if len(out) >= FLUSH_SIZE:
+                sys.stdout.buffer.write(out)
+                out.clear()
         current_file = file
         count = 0
 
     count += int(value)
 
 if current_file is not None:
-    print(f"{current_file}\t{count}")
+    out += b"%s\t%d\n" % (current_file, count)
+sys.stdout.buffer.write(out)
 
 